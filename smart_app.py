@@ -5,22 +5,61 @@ Features:
 - Optional language auto-detect (langdetect if installed)
 - Fuzzy phrase matching and translation adapter
 - Language-aware provider scoring and availability scheduling
-- Booking persistence (data/bookings.json)
+- Booking persistence (data/bookings.jsonl)
 - Ratings & reviews, provider locations with map links
 - Mock SMS/WhatsApp notification adapter
 - Mini analytics dashboard
 - Polished console UX
 """
 
+import atexit
+import heapq
 import json
 import os
 import uuid
-import string
+import threading
+import unicodedata
 import webbrowser
 from datetime import datetime, timedelta
+from functools import lru_cache
 from difflib import get_close_matches
 from collections import Counter
 
+# Optional fast fuzzy matching (falls back to difflib)
+try:
+    from rapidfuzz import process, fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except Exception:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Optional Aho-Corasick keyword scanning (falls back to a compiled regex)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except Exception:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional prefix trie for exact phrasebook hits (falls back to dict lookups)
+try:
+    import pygtrie
+    PYGTRIE_AVAILABLE = True
+except Exception:
+    PYGTRIE_AVAILABLE = False
+
+# Optional faster JSON (falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+# Optional NumPy for scoring large provider catalogs
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    NUMPY_AVAILABLE = False
+
 # Optional language detection
 try:
     from langdetect import detect, DetectorFactory
@@ -29,9 +68,35 @@ try:
 except Exception:
     LANGDETECT_AVAILABLE = False
 
+LANGDETECT_CODES = {'fr': 'French', 'es': 'Spanish', 'te': 'Telugu', 'en': 'English'}
+_langdetect_ready = False
+_langdetect_lock = threading.Lock()
+
+# langdetect loads its profiles on the first detect(); do that exactly once so
+# a detection racing the background warm-up never sees a half-loaded factory
+def ensure_langdetect_loaded():
+    global _langdetect_ready
+    if _langdetect_ready:
+        return
+    with _langdetect_lock:
+        if not _langdetect_ready:
+            try:
+                detect("hello")
+            except Exception:
+                pass
+            _langdetect_ready = True
+
+# Load langdetect profiles in the background so the first translation is warm
+def preload_language_detection():
+    if not LANGDETECT_AVAILABLE:
+        return
+    threading.Thread(target=ensure_langdetect_loaded, daemon=True).start()
+
 DATA_DIR = "data"
-BOOKINGS_FILE = os.path.join(DATA_DIR, "bookings.json")
+BOOKINGS_FILE = os.path.join(DATA_DIR, "bookings.jsonl")
+LEGACY_BOOKINGS_FILE = os.path.join(DATA_DIR, "bookings.json")
 PROVIDERS_FILE = os.path.join(DATA_DIR, "providers.json")
+MAX_LISTED_PROVIDERS = 10  # providers shown when booking
 
 # Demo provider data (includes location and availability)
 default_providers = [
@@ -53,13 +118,22 @@ phrasebook = {
 }
 
 # Utilities
+_data_dir_ready = False
+
 def ensure_data_dir():
+    global _data_dir_ready
+    if _data_dir_ready:
+        return
     os.makedirs(DATA_DIR, exist_ok=True)
+    _data_dir_ready = True
 
 def load_json(path, default):
     ensure_data_dir()
     if os.path.exists(path):
         try:
+            if ORJSON_AVAILABLE:
+                with open(path, "rb") as f:
+                    return orjson.loads(f.read())
             with open(path, "r", encoding="utf-8") as f:
                 return json.load(f)
         except Exception:
@@ -68,50 +142,255 @@ def load_json(path, default):
 
 def save_json(path, data):
     ensure_data_dir()
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Write to a temp file and swap it in so a crash never leaves a torn file
+    tmp = path + ".tmp"
+    if ORJSON_AVAILABLE:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+# JSON-lines helpers: one record per line, so new records are appended
+def _json_line(record):
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record).decode("utf-8") + "\n"
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+def load_jsonl(path, default):
+    ensure_data_dir()
+    if not os.path.exists(path):
+        return default
+    records = []
+    # binary mode so a torn multi-byte character fails inside the per-line try
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                text = line.decode("utf-8")
+                records.append(orjson.loads(text) if ORJSON_AVAILABLE else json.loads(text))
+            except Exception:
+                # a torn or corrupt line only loses that record
+                continue
+    return records
+
+def append_jsonl(path, record):
+    ensure_data_dir()
+    data = _json_line(record).encode("utf-8")
+    with open(path, "a+b") as f:
+        # if the last write was torn, start on a fresh line rather than merging into it
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+        f.write(data)
+
+def save_jsonl(path, records):
+    ensure_data_dir()
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(_json_line(r) for r in records)
+    os.replace(tmp, path)
 
 # Load or initialize data
 providers = load_json(PROVIDERS_FILE, default_providers)
-bookings = load_json(BOOKINGS_FILE, [])
+if os.path.exists(BOOKINGS_FILE) or not os.path.exists(LEGACY_BOOKINGS_FILE):
+    bookings = load_jsonl(BOOKINGS_FILE, [])
+else:
+    # one-time migration from the old single-array bookings.json
+    bookings = load_json(LEGACY_BOOKINGS_FILE, [])
+    save_jsonl(BOOKINGS_FILE, bookings)
+# id -> provider index; shares the dicts in `providers`, which keeps display order
+_providers_by_id = {p["id"]: p for p in providers}
+
+# Derived, underscore-prefixed fields computed once at load (never persisted)
+def _normalize_providers(providers):
+    for p in providers:
+        # running rating totals so add_review doesn't re-sum every review
+        p["_rsum"] = sum(r["rating"] for r in p.get("reviews", []))
+        p["_rcount"] = len(p.get("reviews", []))
+        # match keys so match_providers doesn't re-normalize on every query
+        p["_lang_norm"] = (p.get("language") or "").strip().title()
+        p["_service_lower"] = p["service"].lower()
+
+_normalize_providers(providers)
+# Sum of provider ratings for analytics, kept up to date by add_review
+_provider_rating_total = sum(p.get("rating", 0) for p in providers)
+
+def save_providers():
+    # Underscore-prefixed keys are in-memory caches and are not persisted
+    save_json(PROVIDERS_FILE, [{k: v for k, v in p.items() if not k.startswith("_")} for p in providers])
+
+def save_bookings():
+    save_jsonl(BOOKINGS_FILE, bookings)
+
+# Batched persistence: provider mutations mark the file dirty and it is flushed
+# every FLUSH_EVERY writes and on exit (bookings are appended immediately)
+FLUSH_EVERY = 10
+_SAVERS = {PROVIDERS_FILE: save_providers}
+_dirty = set()
+_pending_writes = 0
+
+def mark_dirty(path):
+    global _pending_writes
+    _dirty.add(path)
+    _pending_writes += 1
+    if _pending_writes >= FLUSH_EVERY:
+        flush()
+
+def flush():
+    global _pending_writes
+    for path in list(_dirty):
+        _SAVERS[path]()
+        _dirty.discard(path)
+    _pending_writes = 0
+
+atexit.register(flush)
 
 # Text normalization and fuzzy helpers
+# str.translate table mapping Unicode punctuation/symbols (categories P*, S*)
+# to a space; letters and combining marks (Telugu vowel signs, NFD accents)
+# are kept. Entries are filled in lazily, once per distinct character.
+class _PunctTable(dict):
+    def __missing__(self, code):
+        ch = chr(code)
+        if ch == "_":
+            out = ""  # dropped outright, as string.punctuation did
+        elif unicodedata.category(ch)[0] in "PS":
+            out = " "
+        else:
+            out = ch
+        self[code] = out
+        return out
+
+_PUNCT_TABLE = _PunctTable()
+
 def normalize_text(s):
-    s = (s or "").strip().lower()
-    s = s.translate(str.maketrans("", "", string.punctuation))
-    return " ".join(s.split())
+    return " ".join((s or "").lower().translate(_PUNCT_TABLE).split())
+
+# Phrasebook is static, so its keys are normalized once at import
+_PHRASEBOOK_KEYS = tuple(phrasebook.keys())
+_PHRASEBOOK_KEYS_NORM = tuple(normalize_text(k) for k in _PHRASEBOOK_KEYS)
+_PHRASEBOOK_INDEX = {k: i for i, k in enumerate(_PHRASEBOOK_KEYS_NORM)}
+_PHRASEBOOK_MAX_WORDS = max(len(k.split(" ")) for k in _PHRASEBOOK_KEYS_NORM)
+if PYGTRIE_AVAILABLE:
+    _KEY_TRIE = pygtrie.CharTrie()
+    for _i, _k in enumerate(_PHRASEBOOK_KEYS_NORM):
+        _KEY_TRIE[_k] = _i
+
+# Longest phrasebook key the query starts with (on a word boundary), e.g.
+# "thank you so much" -> "thank you"; only consulted when fuzzy scoring
+# finds nothing, so a better full-phrase match always wins
+def _prefix_match(phrase_norm):
+    if PYGTRIE_AVAILABLE:
+        best = None
+        for k, i in _KEY_TRIE.prefixes(phrase_norm):
+            if len(k) == len(phrase_norm) or phrase_norm[len(k)] == " ":
+                best = i
+        return best
+    # no key is longer than _PHRASEBOOK_MAX_WORDS, so only those leading words matter
+    words = phrase_norm.split(" ", _PHRASEBOOK_MAX_WORDS)
+    for n in range(min(len(words), _PHRASEBOOK_MAX_WORDS), 0, -1):
+        i = _PHRASEBOOK_INDEX.get(" ".join(words[:n]))
+        if i is not None:
+            return i
+    return None
 
 def fuzzy_match_phrase(phrase):
-    keys = list(phrasebook.keys())
+    return _fuzzy_match_norm(normalize_text(phrase))
+
+@lru_cache(maxsize=1024)
+def _fuzzy_match_norm(phrase_norm):
+    # exact (d=0) hit needs no edit distance
+    i = _PHRASEBOOK_INDEX.get(phrase_norm)
+    if i is None:
+        if RAPIDFUZZ_AVAILABLE:
+            result = process.extractOne(phrase_norm, _PHRASEBOOK_KEYS_NORM, scorer=fuzz.ratio, score_cutoff=60)
+            i = result[2] if result else None
+        else:
+            close = get_close_matches(phrase_norm, _PHRASEBOOK_KEYS_NORM, n=1, cutoff=0.6)
+            i = _PHRASEBOOK_INDEX[close[0]] if close else None
+    if i is None:
+        i = _prefix_match(phrase_norm)
+    return _PHRASEBOOK_KEYS[i] if i is not None else None
+
+def _bigrams(s):
+    return {s[i:i + 2] for i in range(len(s) - 1)}
+
+_PHRASEBOOK_BIGRAMS = tuple(_bigrams(k) for k in _PHRASEBOOK_KEYS_NORM)
+
+def suggest_phrases(phrase, limit=3):
     phrase_norm = normalize_text(phrase)
-    close = get_close_matches(phrase_norm, keys, n=1, cutoff=0.6)
-    return close[0] if close else None
+    # Prefilter: only keys sharing at least one bigram with the query are scored
+    query_bigrams = _bigrams(phrase_norm)
+    shortlist = {i: _PHRASEBOOK_KEYS_NORM[i] for i, bi in enumerate(_PHRASEBOOK_BIGRAMS) if query_bigrams & bi}
+    if not shortlist:
+        return []
+    # Exact prefix hits (e.g. "thank" -> "thank you") need no edit distance
+    prefixed = [_PHRASEBOOK_KEYS[i] for i, k in shortlist.items() if k.startswith(phrase_norm)]
+    if prefixed:
+        return prefixed[:limit]
+    if RAPIDFUZZ_AVAILABLE:
+        matches = process.extract(phrase_norm, shortlist, scorer=fuzz.ratio, limit=limit, score_cutoff=40)
+        return [_PHRASEBOOK_KEYS[m[2]] for m in matches]
+    close = get_close_matches(phrase_norm, list(shortlist.values()), n=limit, cutoff=0.4)
+    return [_PHRASEBOOK_KEYS[_PHRASEBOOK_INDEX[c]] for c in close]
+
+# Keyword hints for the heuristic detector (used when langdetect is missing)
+_LANG_HINTS = {
+    "bonjour": "French", "merci": "French", "où": "French", "combien": "French",
+    "hola": "Spanish", "gracias": "Spanish", "dónde": "Spanish", "cuánto": "Spanish",
+    "namaskaram": "Telugu", "dhanyavadalu": "Telugu", "enta": "Telugu", "ekkada": "Telugu",
+}
+if AHOCORASICK_AVAILABLE:
+    _LANG_HINT_AUTOMATON = ahocorasick.Automaton()
+    for _word, _lang in _LANG_HINTS.items():
+        _LANG_HINT_AUTOMATON.add_word(_word, (_word, _lang))
+    _LANG_HINT_AUTOMATON.make_automaton()
+_LANG_HINT_PRIORITY = ("French", "Spanish", "Telugu")
+# (language, hint words) in priority order, for the plain substring scan
+_LANG_HINT_GROUPS = tuple((lang, tuple(w for w, l in _LANG_HINTS.items() if l == lang)) for lang in _LANG_HINT_PRIORITY)
 
 # Language detection adapter
 def detect_language(text):
     text = (text or "").strip()
     if not text:
         return None
+    return _detect_language_cached(text)
+
+@lru_cache(maxsize=1024)
+def _detect_language_cached(text):
     if LANGDETECT_AVAILABLE:
+        ensure_langdetect_loaded()
         try:
-            code = detect(text)
-            mapping = {'fr': 'French', 'es': 'Spanish', 'te': 'Telugu', 'en': 'English'}
-            return mapping.get(code, None)
+            return LANGDETECT_CODES.get(detect(text), None)
         except Exception:
             return None
-    # Heuristic fallback
+    # Heuristic fallback, in priority order (French > Spanish > Telugu)
     t = text.lower()
-    if any(w in t for w in ["bonjour", "merci", "où", "combien"]):
-        return "French"
-    if any(w in t for w in ["hola", "gracias", "dónde", "cuánto"]):
-        return "Spanish"
-    if any(w in t for w in ["namaskaram", "dhanyavadalu", "enta", "ekkada"]):
-        return "Telugu"
+    if AHOCORASICK_AVAILABLE:
+        # one pass over the text; stop as soon as the top-priority language is seen
+        best = None
+        for _, (_, lang) in _LANG_HINT_AUTOMATON.iter(t):
+            rank = _LANG_HINT_PRIORITY.index(lang)
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return _LANG_HINT_PRIORITY[best] if best is not None else None
+    for lang, words in _LANG_HINT_GROUPS:
+        if any(w in t for w in words):
+            return lang
     return None
 
 # Translation adapter (keeps signature for easy swap to API)
 def translate_phrase(phrase, target_lang):
-    key = fuzzy_match_phrase(phrase)
+    return _lookup_translation(fuzzy_match_phrase(phrase), target_lang)
+
+def _lookup_translation(key, target_lang):
     if not key:
         return None, None
     translations = phrasebook.get(key, {})
@@ -120,26 +399,108 @@ def translate_phrase(phrase, target_lang):
         return translations[lang], key
     return None, key
 
+# I/O-free translation API; target defaults to the detected language
+def translate(phrase, target=None):
+    detected = detect_language(phrase)
+    translated, matched_key = translate_phrase(phrase, target or detected)
+    return translated, matched_key, detected
+
+def translate_batch(phrases, target=None):
+    phrases = list(phrases)
+    if not (RAPIDFUZZ_AVAILABLE and NUMPY_AVAILABLE) or not phrases:
+        return [translate(p, target) for p in phrases]
+    norms = [normalize_text(p) for p in phrases]
+    # one (N x K) score matrix instead of N separate extractOne calls
+    scores = process.cdist(norms, _PHRASEBOOK_KEYS_NORM, scorer=fuzz.ratio, score_cutoff=60)
+    best = scores.argmax(axis=1)
+    results = []
+    for row, (phrase, norm) in enumerate(zip(phrases, norms)):
+        i = _PHRASEBOOK_INDEX.get(norm)
+        if i is None and scores[row, best[row]] > 0:
+            i = best[row]
+        if i is None:
+            i = _prefix_match(norm)
+        key = _PHRASEBOOK_KEYS[i] if i is not None else None
+        detected = detect_language(phrase)
+        translated, matched_key = _lookup_translation(key, target or detected)
+        results.append((translated, matched_key, detected))
+    return results
+
 # Provider matching and scoring
-def match_providers(preferred_language=None, service_filter=None, only_available=True):
+# Column arrays over `providers` for vectorized scoring of large catalogs;
+# rebuilt lazily after any provider mutation
+NUMPY_MIN_PROVIDERS = 256
+_provider_arrays = None
+
+def invalidate_provider_arrays():
+    global _provider_arrays
+    _provider_arrays = None
+
+def _get_provider_arrays():
+    global _provider_arrays
+    if _provider_arrays is None:
+        _provider_arrays = {
+            "rating": np.array([p.get("rating", 0) for p in providers], dtype=np.float64),
+            "lang": np.array([p["_lang_norm"] for p in providers], dtype=object),
+            "service": np.array([p["_service_lower"] for p in providers], dtype=object),
+            "available": np.array([p.get("available", True) for p in providers], dtype=bool),
+            "review_count": np.array([len(p.get("reviews") or []) for p in providers], dtype=np.int32),
+        }
+    return _provider_arrays
+
+def _match_providers_numpy(lang, service_filter, only_available, limit):
+    a = _get_provider_arrays()
+    mask = np.ones(len(providers), dtype=bool)
+    if service_filter is not None:
+        needle = service_filter.lower()
+        mask &= np.fromiter((needle in svc for svc in a["service"]), dtype=bool, count=len(providers))
+    if only_available:
+        mask &= a["available"]
+    idx = np.flatnonzero(mask)
+    score = a["rating"][idx].copy()
+    if lang:
+        score += 100 * (a["lang"][idx] == lang)
+    score += np.minimum(a["review_count"][idx] * 0.1, 1.0)
+    k = len(idx) if limit is None else min(limit, len(idx))
+    if k == 0:
+        return []
+    if k < len(idx):
+        # keep everything tied with the k-th best so tie order stays deterministic
+        kth = np.partition(score, len(score) - k)[len(score) - k]
+        keep = score >= kth
+        idx, score = idx[keep], score[keep]
+    # descending score, ties in catalog order (same as the pure-Python path)
+    order = np.lexsort((idx, -score))[:k]
+    return [providers[i] for i in idx[order]]
+
+def match_providers(preferred_language=None, service_filter=None, only_available=True, limit=None):
     lang = (preferred_language or "").strip().title() if preferred_language else None
-    candidates = [p for p in providers if (service_filter is None or service_filter.lower() in p["service"].lower())]
+    if NUMPY_AVAILABLE and len(providers) >= NUMPY_MIN_PROVIDERS:
+        return _match_providers_numpy(lang, service_filter, only_available, limit)
+    service_filter = service_filter.lower() if service_filter is not None else None
+    candidates = [p for p in providers if (service_filter is None or service_filter in p["_service_lower"])]
     if only_available:
         candidates = [p for p in candidates if p.get("available", True)]
-    scored = []
-    for p in candidates:
-        score = p.get("rating", 0)
-        if lang and p.get("language", "").strip().title() == lang:
-            score += 100
+    # Nothing but rating to rank by: a plain sort, no composite score needed
+    if not lang and not any(p.get("reviews") for p in candidates):
+        ranked = sorted(candidates, key=lambda p: p.get("rating", 0), reverse=True)
+        return ranked if limit is None else ranked[:limit]
+
+    def score(p):
+        s = p.get("rating", 0)
+        if lang and p["_lang_norm"] == lang:
+            s += 100
         # small recency boost if recently reviewed
         if p.get("reviews"):
-            score += min(len(p["reviews"]) * 0.1, 1.0)
-        scored.append((score, p))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return [p for _, p in scored]
+            s += min(len(p["reviews"]) * 0.1, 1.0)
+        return s
+
+    # top-N selection; equivalent to a stable descending sort truncated to limit
+    return heapq.nlargest(limit if limit is not None else len(candidates), candidates, key=score)
 
 # Booking and persistence
 def create_booking(tourist, provider, language=None, phone=None):
+    ts = datetime.utcnow().isoformat() + "Z"
     booking = {
         "id": str(uuid.uuid4())[:8],
         "tourist": tourist,
@@ -149,32 +510,38 @@ def create_booking(tourist, provider, language=None, phone=None):
         "language": language or provider.get("language"),
         "phone": phone,
         "status": "Confirmed",
-        "created_at": datetime.utcnow().isoformat() + "Z",
-        "history": [{"ts": datetime.utcnow().isoformat() + "Z", "status": "Confirmed"}]
+        "created_at": ts,
+        "history": [{"ts": ts, "status": "Confirmed"}]
     }
     bookings.append(booking)
-    save_json(BOOKINGS_FILE, bookings)
+    append_jsonl(BOOKINGS_FILE, booking)
     return booking
 
 def update_provider_availability(provider_id, available, next_available=None):
-    for p in providers:
-        if p["id"] == provider_id:
-            p["available"] = available
-            p["next_available"] = next_available
-            save_json(PROVIDERS_FILE, providers)
-            return True
-    return False
+    p = _providers_by_id.get(provider_id)
+    if p is None:
+        return False
+    p["available"] = available
+    p["next_available"] = next_available
+    invalidate_provider_arrays()
+    mark_dirty(PROVIDERS_FILE)
+    return True
 
 # Reviews
 def add_review(provider_id, rating, comment=""):
-    for p in providers:
-        if p["id"] == provider_id:
-            p.setdefault("reviews", []).append({"rating": rating, "comment": comment, "ts": datetime.utcnow().isoformat()})
-            ratings = [r["rating"] for r in p["reviews"]]
-            p["rating"] = round(sum(ratings) / len(ratings), 2)
-            save_json(PROVIDERS_FILE, providers)
-            return p["rating"]
-    return None
+    global _provider_rating_total
+    p = _providers_by_id.get(provider_id)
+    if p is None:
+        return None
+    p.setdefault("reviews", []).append({"rating": rating, "comment": comment, "ts": datetime.utcnow().isoformat()})
+    p["_rsum"] = p.get("_rsum", 0) + rating
+    p["_rcount"] = p.get("_rcount", 0) + 1
+    new_rating = round(p["_rsum"] / p["_rcount"], 2)
+    _provider_rating_total += new_rating - p.get("rating", 0)
+    p["rating"] = new_rating
+    invalidate_provider_arrays()
+    mark_dirty(PROVIDERS_FILE)
+    return p["rating"]
 
 # Mock notification adapter
 def notify_user_mock(phone, message):
@@ -198,14 +565,16 @@ def analytics_summary():
     if not bookings:
         print("\nNo bookings yet — analytics will appear after bookings.")
         return
-    langs = Counter(b.get('language', 'Unknown') for b in bookings)
-    services = Counter(b['service'] for b in bookings)
-    top_providers = Counter(b['provider_name'] for b in bookings)
+    langs, services, top_providers = Counter(), Counter(), Counter()
+    for b in bookings:
+        langs[b.get('language', 'Unknown')] += 1
+        services[b['service']] += 1
+        top_providers[b['provider_name']] += 1
     print("\n=== Analytics Summary ===")
     print("Bookings by language:", dict(langs))
     print("Top services:", services.most_common(3))
     print("Top providers:", top_providers.most_common(3))
-    avg_rating = round(sum(p.get("rating", 0) for p in providers) / len(providers), 2)
+    avg_rating = round(_provider_rating_total / len(providers), 2)
     print("Average provider rating:", avg_rating)
 
 # Console UI flows
@@ -227,15 +596,14 @@ def translate_message_flow():
     target = input("Translate to (French / Spanish / Telugu) or press Enter to use detected language: ").strip()
     if not target and detected:
         target = detected
-    translated, matched_key = translate_phrase(phrase, target)
+    translated, matched_key, _ = translate(phrase, target)
     if translated:
         print(f"\nTranslated ({matched_key} → {target.strip().title()}): {translated}")
     elif matched_key:
         print(f"\nNo translation for '{matched_key}' in {target.strip().title()}.")
     else:
         # suggest close phrases
-        keys = list(phrasebook.keys())
-        close = get_close_matches(normalize_text(phrase), keys, n=3, cutoff=0.4)
+        close = suggest_phrases(phrase)
         if close:
             print("\nCould not find an exact phrase. Did you mean:", ", ".join(close))
         else:
@@ -249,10 +617,10 @@ def book_service_flow():
     phone = input("Phone (optional, for mock notification): ").strip() or None
     pref_lang = input("Preferred language (optional): ").strip().title() or None
     service_want = input("What service do you want (taxi / tour / city) or leave blank for any: ").strip().lower() or None
-    matched = match_providers(pref_lang, service_filter=service_want, only_available=True)
+    matched = match_providers(pref_lang, service_filter=service_want, only_available=True, limit=MAX_LISTED_PROVIDERS)
     if not matched:
         print("No immediate providers match your preferences. Showing all providers (including busy).")
-        matched = match_providers(pref_lang, service_filter=service_want, only_available=False)
+        matched = match_providers(pref_lang, service_filter=service_want, only_available=False, limit=MAX_LISTED_PROVIDERS)
     show_providers(matched)
     choice = input("Select provider number to book (or 'c' to cancel): ").strip()
     if choice.lower() == 'c':
@@ -274,7 +642,8 @@ def book_service_flow():
             # simulate scheduling by setting next_available to now + 1 hour
             provider["next_available"] = (datetime.utcnow() + timedelta(hours=1)).isoformat() + "Z"
             provider["available"] = False
-            save_json(PROVIDERS_FILE, providers)
+            invalidate_provider_arrays()
+            mark_dirty(PROVIDERS_FILE)
         booking = create_booking(name, provider, language=pref_lang, phone=phone)
         print("\nBooking Confirmed!")
         print(f"Booking ID: {booking['id']}")
@@ -375,6 +744,7 @@ def main():
 
 if __name__ == "__main__":
     # Ensure initial data saved so persistence works on first run
-    save_json(PROVIDERS_FILE, providers)
-    save_json(BOOKINGS_FILE, bookings)
+    save_providers()
+    save_bookings()
+    preload_language_detection()
     main()
\ No newline at end of file